@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Rendering benchmark for check_host.py
+
+Renders a batch of hosts x nodes result tables with the shared
+ResultRenderer and reports the throughput, next to the print-per-line
+display code it replaced. Results are synthetic by default, or taken from
+the final result polls of a --record file.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from colorama import Fore, Style
+
+import check_host
+
+
+def synthetic_results(hosts: int, seed: int = 0) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Build raw results for every node of the registry.
+
+    Args:
+        hosts: Number of hosts, each checked with ping and HTTP
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        List of (check_type, raw_results) pairs
+    """
+    rng = random.Random(seed)
+    workload = []
+    for _ in range(hosts):
+        ping = {
+            node: [[["OK" if rng.random() < 0.95 else "TIMEOUT", rng.uniform(0.005, 0.3), "93.184.216.34"]
+                    for _ in range(4)]]
+            for node in check_host.NODE_DETAILS
+        }
+        http = {
+            node: [[1 if rng.random() < 0.95 else 0, rng.uniform(0.05, 1.5), "OK", "200", "93.184.216.34"]]
+            for node in check_host.NODE_DETAILS
+        }
+        workload.append(("ping", ping))
+        workload.append(("http", http))
+    return workload
+
+
+def recorded_results(filename: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Read the last result poll of every check in a recording.
+
+    Args:
+        filename: NDJSON file written by --record
+
+    Returns:
+        List of (check_type, raw_results) pairs
+    """
+    check_types = {}
+    results = {}
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry["path"].startswith("/check-result/"):
+                results[entry["path"][len("/check-result/"):]] = entry["response"]
+            else:
+                check_types[entry["response"].get("request_id")] = entry["path"][len("/check-"):]
+
+    return [
+        (check_types[request_id], raw) for request_id, raw in results.items()
+        if check_types.get(request_id) in ("ping", "http")
+    ]
+
+
+def legacy_display_ping_results(parsed_results: Dict[str, Any]) -> None:
+    """
+    Display ping results the way check_host.py did before ResultRenderer,
+    with one print per line. Kept as the reference for the benchmark.
+
+    Args:
+        parsed_results: Parsed ping results
+    """
+    print("\n" + "=" * 80)
+    print(f"{Fore.CYAN}PING RESULTS SUMMARY{Style.RESET_ALL}")
+    print("=" * 80)
+
+    # Overall statistics
+    overall = parsed_results["overall_stats"]
+    success_ratio = f"{overall['successful']}/{overall['total']}"
+    success_color = Fore.GREEN if overall['successful'] == overall['total'] else Fore.RED
+
+    print(f"\n{Fore.YELLOW}Overall Statistics:{Style.RESET_ALL}")
+    print(f"  Success Rate: {success_color}{success_ratio}{Style.RESET_ALL}")
+    if overall['successful'] > 0:
+        print(f"  Average RTT: {overall['avg_rtt']:.1f} ms")
+        print(f"  Min/Max RTT: {overall['min_rtt']:.1f} ms / {overall['max_rtt']:.1f} ms")
+
+    # Continent statistics
+    print(f"\n{Fore.YELLOW}Statistics by Continent:{Style.RESET_ALL}")
+    for continent, stats in parsed_results["continent_stats"].items():
+        success_ratio = f"{stats['successful']}/{stats['total']}"
+        success_color = Fore.GREEN if stats['successful'] == stats['total'] else Fore.RED
+
+        print(f"  {continent}:")
+        print(f"    Success Rate: {success_color}{success_ratio}{Style.RESET_ALL}")
+        if stats['successful'] > 0:
+            print(f"    Average RTT: {stats['avg_rtt']:.1f} ms")
+            print(f"    Min/Max RTT: {stats['min_rtt']:.1f} ms / {stats['max_rtt']:.1f} ms")
+
+    # Detailed node results
+    print(f"\n{Fore.YELLOW}Detailed Results by Node:{Style.RESET_ALL}")
+    print(f"{'Location':<30} {'Result':<10} {'RTT min/avg/max':<25} {'IP Address':<15}")
+    print("-" * 80)
+
+    # Sort by continent and then by country
+    sorted_results = sorted(
+        parsed_results["nodes_results"],
+        key=lambda x: (x["continent"], x["country"], x["city"])
+    )
+
+    for result in sorted_results:
+        location = f"{result['country']}, {result['city']}"
+        success_ratio = f"{result['successful']}/{result['total']}"
+        success_color = Fore.GREEN if result['successful'] == result['total'] else Fore.RED
+
+        if result['successful'] > 0:
+            rtt_stats = f"{result['min_rtt']:.1f} / {result['avg_rtt']:.1f} / {result['max_rtt']:.1f} ms"
+        else:
+            rtt_stats = "N/A"
+
+        print(f"{location:<30} {success_color}{success_ratio:<10}{Style.RESET_ALL} {rtt_stats:<25} {result['ip']:<15}")
+
+
+def legacy_display_http_results(parsed_results: Dict[str, Any]) -> None:
+    """
+    Display HTTP results the way check_host.py did before ResultRenderer,
+    with one print per line. Kept as the reference for the benchmark.
+
+    Args:
+        parsed_results: Parsed HTTP results
+    """
+    print("\n" + "=" * 80)
+    print(f"{Fore.CYAN}HTTP RESULTS SUMMARY{Style.RESET_ALL}")
+    print("=" * 80)
+
+    # Overall statistics
+    overall = parsed_results["overall_stats"]
+    success_ratio = f"{overall['successful']}/{overall['total']}"
+    success_color = Fore.GREEN if overall['successful'] == overall['total'] else Fore.RED
+
+    print(f"\n{Fore.YELLOW}Overall Statistics:{Style.RESET_ALL}")
+    print(f"  Success Rate: {success_color}{success_ratio}{Style.RESET_ALL}")
+    if overall['successful'] > 0:
+        print(f"  Average Response Time: {overall['avg_response_time']:.1f} ms")
+
+    # Continent statistics
+    print(f"\n{Fore.YELLOW}Statistics by Continent:{Style.RESET_ALL}")
+    for continent, stats in parsed_results["continent_stats"].items():
+        success_ratio = f"{stats['successful']}/{stats['total']}"
+        success_color = Fore.GREEN if stats['successful'] == stats['total'] else Fore.RED
+
+        print(f"  {continent}:")
+        print(f"    Success Rate: {success_color}{success_ratio}{Style.RESET_ALL}")
+        if stats['successful'] > 0:
+            print(f"    Average Response Time: {stats['avg_response_time']:.1f} ms")
+
+    # Detailed node results
+    print(f"\n{Fore.YELLOW}Detailed Results by Node:{Style.RESET_ALL}")
+    print(f"{'Location':<30} {'Status':<15} {'Response Time':<15} {'IP Address':<15}")
+    print("-" * 80)
+
+    # Sort by continent and then by country
+    sorted_results = sorted(
+        parsed_results["nodes_results"],
+        key=lambda x: (x["continent"], x["country"], x["city"])
+    )
+
+    for result in sorted_results:
+        location = f"{result['country']}, {result['city']}"
+
+        status = f"{result['status_code']} {result['status_msg']}"
+        status_color = Fore.GREEN if result['success'] else Fore.RED
+
+        response_time = f"{result['response_time']:.1f} ms" if result['success'] else "N/A"
+
+        print(f"{location:<30} {status_color}{status:<15}{Style.RESET_ALL} {response_time:<15} {result['ip']:<15}")
+
+
+def main():
+    """Run the benchmark and print the throughput."""
+    parser = argparse.ArgumentParser(description='Benchmark rendering of result tables.')
+    parser.add_argument('--hosts', type=int, default=200,
+                      help='Number of synthetic hosts, each with a ping and an HTTP table (default: 200)')
+    parser.add_argument('--recording', metavar='FILE',
+                      help='Use the results of a --record file instead of synthetic ones')
+    parser.add_argument('--repeat', type=int, default=5,
+                      help='Number of timed passes over the workload (default: 5)')
+    args = parser.parse_args()
+
+    workload = recorded_results(args.recording) if args.recording else synthetic_results(args.hosts)
+    parsed = [(check_type, check_host.parse_results(check_type, raw)) for check_type, raw in workload]
+    rows = sum(len(results["nodes_results"]) for _, results in parsed)
+    print(f"Workload: {len(parsed)} tables, {rows} node rows")
+
+    legacy = {"ping": legacy_display_ping_results, "http": legacy_display_http_results}
+
+    def render(color: bool) -> None:
+        out = io.StringIO()
+        for check_type, results in parsed:
+            out.write(check_host.ResultRenderer.get(check_type, color=color).render(results))
+
+    def render_legacy() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for check_type, results in parsed:
+                legacy[check_type](results)
+
+    # Every variant writes into a StringIO, so terminal speed does not skew the comparison
+    for label, run in (("display", lambda: render(True)), ("txt", lambda: render(False)),
+                       ("legacy", render_legacy)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+        print(f"{label:<8} {best * 1000:8.1f} ms  {len(parsed) / best:10.0f} tables/s  {rows / best:12.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
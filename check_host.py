@@ -12,18 +12,39 @@ Using the Check-Host API for global testing.
 """
 
 import argparse
+import contextlib
+import gzip
 import json
+import mmap
+import re
 import time
 import requests
 import sys
 import os
+import heapq
+import itertools
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple, Set
+from typing import Dict, Any, List, Optional, Tuple, Set, Callable, Iterator
 from collections import defaultdict
 import ipaddress
 import colorama
 from colorama import Fore, Style, Back
 
+# File locking for archive writers: fcntl on POSIX, msvcrt on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
 # Initialize colorama for cross-platform colored terminal output
 colorama.init(autoreset=True)
 
@@ -114,15 +135,116 @@ NODE_DETAILS = {
     "vn1.node.check-host.net": {"country": "Vietnam", "city": "Ho Chi Minh City", "continent": "AS"}
 }
 
+# Registry order of the nodes: by continent, then country, then city
+NODE_ORDER = {
+    node: rank for rank, node in enumerate(sorted(
+        NODE_DETAILS, key=lambda node: (NODE_DETAILS[node]["continent"], NODE_DETAILS[node]["country"],
+                                        NODE_DETAILS[node]["city"])
+    ))
+}
+
+
+class RateLimiter:
+    """Thread-safe token bucket used to cap the request rate to the API."""
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            rate: Sustained number of requests allowed per second
+            burst: Maximum number of requests allowed back to back
+        """
+        if rate <= 0:
+            raise ValueError("Rate limit must be greater than zero")
+        self.rate = rate
+        self.capacity = float(burst if burst else max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available, without blocking.
+        
+        Returns:
+            0 if a request may be sent now, otherwise the seconds until one may
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+    
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            time.sleep(wait)
+
+
 class CheckHostAPI:
     """Client for the Check-Host API, focused on PING,HTTP,TCP,UDP,DNS checks."""
     
     BASE_URL = "https://check-host.net"
+    POLL_INTERVAL = 2
     
-    def __init__(self):
-        """Initialize the API client with proper headers."""
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None, pool_size: int = 10,
+                 exit_on_error: bool = True, recorder: Optional["TrafficRecorder"] = None,
+                 request_timeout: float = 10):
+        """
+        Initialize the API client with proper headers.
+        
+        Args:
+            rate_limiter: Optional limiter shared by every request of this client
+            pool_size: Number of keep-alive connections kept by the session
+            exit_on_error: Exit the program on request errors instead of raising
+            recorder: Optional recorder capturing every API response
+            request_timeout: Seconds to wait for the API before a request fails
+        """
         self.session = requests.Session()
         self.session.headers.update({"Accept": "application/json"})
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.rate_limiter = rate_limiter
+        self.exit_on_error = exit_on_error
+        self.recorder = recorder
+        self.request_timeout = request_timeout
+    
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a GET request and decode its JSON body, honouring the rate limiter if one is set."""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = self.session.get(f"{self.BASE_URL}{path}", params=params, timeout=self.request_timeout)
+        except requests.exceptions.RequestException as e:
+            if self.recorder:
+                self.recorder.record(path, params, None, started, time.monotonic() - started, error=e)
+            raise
+        
+        try:
+            result = response.json()
+        except ValueError:
+            result = None
+        if self.recorder:
+            body = result if result is not None else response.text
+            self.recorder.record(path, params, body, started, time.monotonic() - started,
+                                 status=response.status_code)
+        response.raise_for_status()
+        return result if result is not None else response.json()
+    
+    def close(self) -> None:
+        """Close the session and the recording, if any."""
+        self.session.close()
+        if self.recorder:
+            self.recorder.close()
     
     def run_check(self, check_type: str, host: str, nodes: List[str]) -> Dict[str, Any]:
         """
@@ -139,7 +261,7 @@ class CheckHostAPI:
         if check_type not in ["ping", "http", "tcp", "udp", "dns"]:
             raise ValueError(f"Check type must be 'ping', 'http', 'tcp', 'udp', or 'dns'")
         
-        url = f"{self.BASE_URL}/check-{check_type}"
+        path = f"/check-{check_type}"
         params = {"host": host}
         
         # Add each node as a separate parameter
@@ -147,41 +269,70 @@ class CheckHostAPI:
             params["node"] = nodes
         
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            return self._get(path, params=params)
         except requests.exceptions.RequestException as e:
+            if not self.exit_on_error:
+                raise
             print(f"{Fore.RED}Error making API request: {e}")
             sys.exit(1)
     
-    def get_check_result(self, request_id: str, timeout: int = 30) -> Dict[str, Any]:
+    def poll_check_result(self, request_id: str) -> Dict[str, Any]:
+        """
+        Fetch the current, possibly partial, results of a check once.
+        
+        Args:
+            request_id: The request ID returned from run_check
+            
+        Returns:
+            Check results, with None for nodes that have not answered yet
+        """
+        return self._get(f"/check-result/{request_id}")
+    
+    def _poll_delay(self, request_id: str) -> Optional[float]:
+        """
+        Return how long get_check_result waits before polling a check again.
+        
+        Args:
+            request_id: The request ID being polled
+            
+        Returns:
+            Seconds to wait, or None if polling again cannot change the results
+        """
+        return self.POLL_INTERVAL
+    
+    def get_check_result(self, request_id: str, timeout: int = 30,
+                         on_update: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Get the results of a check, polling until complete or timeout.
         
         Args:
             request_id: The request ID returned from run_check
             timeout: Maximum time to wait for results in seconds
+            on_update: Optional callback receiving every partial result polled
             
         Returns:
             Check results
         """
-        url = f"{self.BASE_URL}/check-result/{request_id}"
+        result = {}
         
         # Poll until results are available or timeout
         start_time = time.time()
         
         while time.time() - start_time < timeout:
             try:
-                response = self.session.get(url)
-                response.raise_for_status()
-                result = response.json()
+                result = self.poll_check_result(request_id)
+                if on_update:
+                    on_update(result)
                 
                 # Check if all results are available (not None)
                 if not any(v is None for v in result.values()):
                     return result
                     
                 # Wait before trying again
-                time.sleep(2)
+                delay = self._poll_delay(request_id)
+                if delay is None:
+                    break
+                time.sleep(delay)
             except requests.exceptions.RequestException as e:
                 print(f"{Fore.RED}Error getting results: {e}")
                 return {}
@@ -190,6 +341,399 @@ class CheckHostAPI:
         return result  # Return partial results if timeout
 
 
+class TrafficRecorder:
+    """Writes every API response with its timing to an NDJSON file for later replay."""
+    
+    def __init__(self, filename: str):
+        """
+        Open the recording, appending to it if it already exists.
+        
+        Args:
+            filename: NDJSON file receiving one line per API response
+        """
+        self.filename = filename
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.file = open(filename, 'a', encoding='utf-8')
+    
+    def record(self, path: str, params: Optional[Dict[str, Any]], response: Any,
+               started: float, duration: float, status: Optional[int] = None,
+               error: Optional[Exception] = None) -> None:
+        """
+        Append one API response, or the error that replaced it, to the recording.
+        
+        Args:
+            path: Requested API path, e.g. '/check-ping' or '/check-result/<id>'
+            params: Query parameters of the request
+            response: Decoded JSON body, or the raw text if it was not JSON
+            started: time.monotonic() at which the request was sent
+            duration: Seconds the request took
+            status: HTTP status code of the response
+            error: Exception raised instead of receiving a response
+        """
+        entry = {
+            "time": round(started - self.started, 4),
+            "duration": round(duration, 4),
+            "path": path,
+            "params": params or {},
+            "status": status,
+            "response": response
+        }
+        if error is not None:
+            entry["error"] = {"type": type(error).__name__, "message": str(error)}
+        line = json.dumps(entry, separators=(",", ":"))
+        with self.lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+    
+    def close(self) -> None:
+        """Close the recording file."""
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+
+class ReplayAPI(CheckHostAPI):
+    """Serves API responses captured by TrafficRecorder instead of calling check-host.net.
+    
+    Check submissions are answered with the recorded submission for the same
+    check type and host (falling back to the next unused one of that type).
+    Result polls return the latest response that had been recorded at the same
+    time after submission, so nodes answer when they did in the recording
+    whatever the polling schedule. A speed above 1 accelerates the replay, a
+    speed of 0 disables timing and returns the recorded polls one after another.
+    """
+    
+    def __init__(self, filename: str, speed: float = 1.0, **kwargs: Any):
+        """
+        Load a recording.
+        
+        Args:
+            filename: NDJSON file written by TrafficRecorder
+            speed: Replay speed factor, 0 to replay without any delay
+            **kwargs: Passed on to CheckHostAPI
+        """
+        super().__init__(**kwargs)
+        self.speed = speed
+        self.lock = threading.Lock()
+        self.submissions: List[Dict[str, Any]] = []
+        self.polls: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.replays: Dict[str, Dict[str, Any]] = {}
+        
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["path"].startswith("/check-result/"):
+                    self.polls[entry["path"][len("/check-result/"):]].append(entry)
+                else:
+                    self.submissions.append(entry)
+    
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Return the recorded response matching a request."""
+        if path.startswith("/check-result/"):
+            return self._replay_poll(path[len("/check-result/"):])
+        return self._replay_submission(path, params or {})
+    
+    def _raise_recorded_error(self, entry: Dict[str, Any]) -> None:
+        """Raise the transport error or HTTP error status captured in a recorded entry."""
+        if "error" in entry:
+            error_type = getattr(requests.exceptions, entry["error"]["type"], requests.exceptions.RequestException)
+            if not (isinstance(error_type, type) and issubclass(error_type, requests.exceptions.RequestException)):
+                error_type = requests.exceptions.RequestException
+            raise error_type(entry["error"]["message"])
+        
+        status = entry.get("status")
+        if status is not None and status >= 400:
+            response = requests.Response()
+            response.status_code = status
+            response.url = f"{self.BASE_URL}{entry['path']}"
+            try:
+                response.reason = HTTPStatus(status).phrase
+            except ValueError:
+                response.reason = ""
+            body = entry["response"]
+            response._content = (body if isinstance(body, str) else json.dumps(body)).encode("utf-8")
+            response.raise_for_status()
+    
+    def _delay(self, seconds: float) -> None:
+        """Sleep for a recorded duration, scaled by the replay speed."""
+        if self.speed > 0 and seconds > 0:
+            time.sleep(seconds / self.speed)
+    
+    def _replay_submission(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer a check submission from the recording."""
+        with self.lock:
+            candidates = [entry for entry in self.submissions if entry["path"] == path]
+            matching = [entry for entry in candidates if entry["params"].get("host") == params.get("host")]
+            if not (matching or candidates):
+                raise ValueError(f"No recorded response for {path} {params.get('host', '')}")
+            entry = (matching or candidates)[0]
+            self.submissions.remove(entry)
+        
+        self._delay(entry["duration"])
+        self._raise_recorded_error(entry)
+        response = entry["response"]
+        with self.lock:
+            self.replays[response.get("request_id")] = {
+                "started": time.monotonic(),
+                "submitted": entry["time"] + entry["duration"],
+                "polls": 0,
+                "served": -1
+            }
+        return response
+    
+    def _replay_poll(self, request_id: str) -> Dict[str, Any]:
+        """Answer a result poll from the recording."""
+        polls = self.polls.get(request_id)
+        replay = self.replays.get(request_id)
+        if not polls or replay is None:
+            raise ValueError(f"No recorded results for request {request_id}")
+        
+        with self.lock:
+            if self.speed > 0:
+                elapsed = (time.monotonic() - replay["started"]) * self.speed
+                answered = [entry for entry in polls if entry["time"] + entry["duration"] - replay["submitted"] <= elapsed]
+                served = len(answered) - 1
+            else:
+                served = min(replay["polls"], len(polls) - 1)
+            entry = polls[served] if served >= 0 else None
+            replay["polls"] += 1
+            replay["served"] = served
+        
+        if entry is None:
+            # Polled earlier than in the recording: nothing has answered yet
+            self._delay(polls[0]["duration"])
+            answers = next((poll["response"] for poll in polls if isinstance(poll["response"], dict)), {})
+            return {node: None for node in answers}
+        self._delay(entry["duration"])
+        self._raise_recorded_error(entry)
+        return entry["response"]
+    
+    def _poll_delay(self, request_id: str) -> Optional[float]:
+        """Scale the poll interval by the replay speed, stopping once the recording is used up."""
+        replay = self.replays.get(request_id)
+        if replay is not None and replay["served"] == len(self.polls.get(request_id, [])) - 1:
+            return None
+        return self.POLL_INTERVAL / self.speed if self.speed > 0 else 0
+
+
+def create_api(record: Optional[str] = None, replay: Optional[str] = None,
+               replay_speed: float = 1.0, **kwargs: Any) -> CheckHostAPI:
+    """
+    Create the API client selected on the command line.
+    
+    Args:
+        record: File to record every API response to
+        replay: Recording to serve responses from instead of check-host.net
+        replay_speed: Replay speed factor, 0 to replay without any delay
+        **kwargs: Passed on to CheckHostAPI
+        
+    Returns:
+        API client
+    """
+    if replay:
+        return ReplayAPI(replay, speed=replay_speed, **kwargs)
+    if record:
+        return CheckHostAPI(recorder=TrafficRecorder(record), **kwargs)
+    return CheckHostAPI(**kwargs)
+
+
+class ResultPoller:
+    """Schedules the polling of many outstanding checks from a single thread.
+    
+    Outstanding request IDs are kept in a heap ordered by their next poll
+    time. Each check starts with a short interval that grows while no new
+    nodes answer, and every poll goes through one shared rate limiter. The
+    HTTP calls run on a small bounded pool, but the heap, the schedule and
+    the futures are only touched by the loop thread, which also resolves
+    checks whose deadline passed, even while their last poll is in flight.
+    """
+    
+    MIN_INTERVAL = 1.0
+    MAX_INTERVAL = 5.0
+    BACKOFF = 1.5
+    
+    def __init__(self, api: CheckHostAPI, max_qps: float = 5, workers: int = 4):
+        """
+        Initialize the poller and start its thread.
+        
+        Args:
+            api: API client used for every poll
+            max_qps: Maximum number of polls per second across all checks
+            workers: Maximum number of polls in flight at the same time
+        """
+        self.api = api
+        self.rate_limiter = RateLimiter(max_qps)
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poll")
+        self.heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self.deadlines: List[Tuple[float, int, Dict[str, Any]]] = []
+        self.submitted: List[Dict[str, Any]] = []
+        self.completed: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[Exception]]] = []
+        self.in_flight = 0
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name="result-poller", daemon=True)
+        self.thread.start()
+    
+    def submit(self, request_id: str, timeout: float = 30,
+               on_update: Optional[Callable[[Dict[str, Any]], None]] = None) -> Future:
+        """
+        Start polling a check.
+        
+        Args:
+            request_id: The request ID returned from run_check
+            timeout: Maximum time to wait for results in seconds
+            on_update: Optional callback receiving every partial result polled
+            
+        Returns:
+            Future resolving to the complete, or at the deadline partial, results,
+            or failing with the last poll error if no poll succeeded
+        """
+        now = time.monotonic()
+        entry = {
+            "request_id": request_id,
+            "next_poll": now + min(self.MIN_INTERVAL, timeout),
+            "deadline": now + timeout,
+            "interval": self.MIN_INTERVAL,
+            "answered": 0,
+            "result": {},
+            "polled": False,
+            "error": None,
+            "on_update": on_update,
+            "future": Future()
+        }
+        with self.condition:
+            self.submitted.append(entry)
+            self.condition.notify()
+        return entry["future"]
+    
+    def stop(self) -> None:
+        """Stop the poller, resolving outstanding checks with their partial results."""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for _, _, entry in self.deadlines:
+            self._resolve(entry)
+        for entry in self.submitted:
+            self._resolve(entry)
+        self.heap.clear()
+        self.deadlines.clear()
+        self.submitted.clear()
+    
+    @staticmethod
+    def _resolve(entry: Dict[str, Any], error: Optional[Exception] = None) -> None:
+        """
+        Resolve a check with its latest results, unless it already is. A check
+        none of whose polls succeeded fails with the last poll error instead.
+        """
+        if entry["future"].done():
+            return
+        if error is None and not entry["polled"]:
+            error = entry["error"]
+        if error is not None:
+            entry["future"].set_exception(error)
+        else:
+            entry["future"].set_result(entry["result"])
+    
+    def _loop(self) -> None:
+        """Dispatch due polls, handle finished ones and expire deadlines, forever."""
+        while True:
+            with self.condition:
+                if not self.running:
+                    return
+                submitted, self.submitted = self.submitted, []
+                completed, self.completed = self.completed, []
+            
+            for entry in submitted:
+                heapq.heappush(self.heap, (entry["next_poll"], next(self.counter), entry))
+                heapq.heappush(self.deadlines, (entry["deadline"], next(self.counter), entry))
+            for entry, result, error in completed:
+                self.in_flight -= 1
+                try:
+                    self._handle(entry, result, error)
+                except Exception as e:
+                    self._resolve(entry, e)
+            
+            now = time.monotonic()
+            while self.deadlines and self.deadlines[0][0] <= now:
+                self._resolve(heapq.heappop(self.deadlines)[2])
+            while self.heap and self.heap[0][2]["future"].done():
+                heapq.heappop(self.heap)
+            
+            wait = None
+            while self.heap and self.in_flight < self.workers:
+                if self.heap[0][0] > now:
+                    wait = self.heap[0][0] - now
+                    break
+                rate_wait = self.rate_limiter.try_acquire()
+                if rate_wait:
+                    wait = rate_wait
+                    break
+                entry = heapq.heappop(self.heap)[2]
+                if entry["future"].done():
+                    continue
+                self.in_flight += 1
+                self.executor.submit(self._fetch, entry)
+            
+            if self.deadlines:
+                deadline_wait = max(self.deadlines[0][0] - now, 0)
+                wait = deadline_wait if wait is None else min(wait, deadline_wait)
+            
+            with self.condition:
+                if self.running and not self.submitted and not self.completed:
+                    self.condition.wait(wait)
+    
+    def _fetch(self, entry: Dict[str, Any]) -> None:
+        """Poll one check once on a worker thread and hand the outcome back to the loop."""
+        result, error = None, None
+        try:
+            result = self.api.poll_check_result(entry["request_id"])
+        except (requests.exceptions.RequestException, ValueError) as e:
+            error = e
+        with self.condition:
+            self.completed.append((entry, result, error))
+            self.condition.notify()
+    
+    def _handle(self, entry: Dict[str, Any], result: Optional[Dict[str, Any]],
+                error: Optional[Exception]) -> None:
+        """Process the outcome of one poll and either resolve or reschedule the check."""
+        if entry["future"].done():
+            return
+        
+        if error is None:
+            entry["polled"] = True
+            entry["result"] = result
+            if entry["on_update"]:
+                entry["on_update"](result)
+            
+            answered = sum(1 for v in result.values() if v is not None)
+            if result and answered == len(result):
+                self._resolve(entry)
+                return
+            
+            # Poll again soon while nodes keep answering, back off otherwise
+            if answered > entry["answered"]:
+                entry["interval"] = self.MIN_INTERVAL
+            else:
+                entry["interval"] = min(entry["interval"] * self.BACKOFF, self.MAX_INTERVAL)
+            entry["answered"] = answered
+        else:
+            entry["error"] = error
+            entry["interval"] = min(entry["interval"] * self.BACKOFF, self.MAX_INTERVAL)
+        
+        now = time.monotonic()
+        if now >= entry["deadline"]:
+            self._resolve(entry)
+            return
+        heapq.heappush(self.heap, (min(now + entry["interval"], entry["deadline"]), next(self.counter), entry))
+
+
 def validate_host(host: str) -> str:
     """
     Validate and format the host input.
@@ -428,62 +972,191 @@ def parse_http_results(results: Dict[str, Any]) -> Dict[str, Any]:
     return parsed_results
 
 
-def display_ping_results(parsed_results: Dict[str, Any]) -> None:
+def parse_results(check_type: str, results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """
-    Display ping results in a formatted table.
+    Parse raw results for the check types that have a structured parser.
     
     Args:
-        parsed_results: Parsed ping results
+        check_type: Type of check the results belong to
+        results: Raw results from API
+        
+    Returns:
+        Structured results, or None for TCP, UDP and DNS checks
     """
-    print("\n" + "=" * 80)
-    print(f"{Fore.CYAN}PING RESULTS SUMMARY{Style.RESET_ALL}")
-    print("=" * 80)
+    if check_type == "ping":
+        return parse_ping_results(results)
+    if check_type == "http":
+        return parse_http_results(results)
+    return None
+
+
+def build_full_results(check_type: str, host: str, check_response: Dict[str, Any],
+                       results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine check metadata, raw results and parsed statistics.
     
-    # Overall statistics
-    overall = parsed_results["overall_stats"]
-    success_ratio = f"{overall['successful']}/{overall['total']}"
-    success_color = Fore.GREEN if overall['successful'] == overall['total'] else Fore.RED
+    Args:
+        check_type: Type of check that was run
+        host: Host that was checked
+        check_response: API response returned by run_check
+        results: Raw results from API
+        
+    Returns:
+        Results in the layout written by save_results_to_file
+    """
+    full_results = {
+        "check_type": check_type,
+        "host": host,
+        "timestamp": datetime.now().isoformat(),
+        "permanent_link": check_response.get("permanent_link", ""),
+        "request_id": check_response.get("request_id"),
+        "raw_results": results
+    }
     
-    print(f"\n{Fore.YELLOW}Overall Statistics:{Style.RESET_ALL}")
-    print(f"  Success Rate: {success_color}{success_ratio}{Style.RESET_ALL}")
-    if overall['successful'] > 0:
-        print(f"  Average RTT: {overall['avg_rtt']:.1f} ms")
-        print(f"  Min/Max RTT: {overall['min_rtt']:.1f} ms / {overall['max_rtt']:.1f} ms")
+    # For ping and http, add the parsed results
+    parsed_results = parse_results(check_type, results)
+    if parsed_results is not None:
+        full_results.update(parsed_results)
     
-    # Continent statistics
-    print(f"\n{Fore.YELLOW}Statistics by Continent:{Style.RESET_ALL}")
-    for continent, stats in parsed_results["continent_stats"].items():
-        success_ratio = f"{stats['successful']}/{stats['total']}"
-        success_color = Fore.GREEN if stats['successful'] == stats['total'] else Fore.RED
-        
-        print(f"  {continent}:")
-        print(f"    Success Rate: {success_color}{success_ratio}{Style.RESET_ALL}")
-        if stats['successful'] > 0:
-            print(f"    Average RTT: {stats['avg_rtt']:.1f} ms")
-            print(f"    Min/Max RTT: {stats['min_rtt']:.1f} ms / {stats['max_rtt']:.1f} ms")
-    
-    # Detailed node results
-    print(f"\n{Fore.YELLOW}Detailed Results by Node:{Style.RESET_ALL}")
-    print(f"{'Location':<30} {'Result':<10} {'RTT min/avg/max':<25} {'IP Address':<15}")
-    print("-" * 80)
-    
-    # Sort by continent and then by country
-    sorted_results = sorted(
-        parsed_results["nodes_results"], 
-        key=lambda x: (x["continent"], x["country"], x["city"])
-    )
+    return full_results
+
+
+class ResultRenderer:
+    """Renders parsed ping and HTTP results as text tables.
     
-    for result in sorted_results:
-        location = f"{result['country']}, {result['city']}"
-        success_ratio = f"{result['successful']}/{result['total']}"
-        success_color = Fore.GREEN if result['successful'] == result['total'] else Fore.RED
+    Column layouts and color codes are compiled into format strings once per
+    (check type, color) pair, nodes are ordered by their precomputed rank in
+    NODE_ORDER, and a whole table is returned as one string so callers issue a
+    single write.
+    """
+    
+    _cache: Dict[Tuple[str, bool], "ResultRenderer"] = {}
+    
+    def __init__(self, check_type: str, color: bool = True):
+        """
+        Compile the layout of a check type.
+        
+        Args:
+            check_type: Either 'ping' or 'http'
+            color: Whether to include terminal color codes
+        """
+        self.check_type = check_type
+        self.color = color
+        self.good = Fore.GREEN if color else ""
+        self.bad = Fore.RED if color else ""
+        reset = Style.RESET_ALL if color else ""
+        heading = Fore.YELLOW if color else ""
         
-        if result['successful'] > 0:
-            rtt_stats = f"{result['min_rtt']:.1f} / {result['avg_rtt']:.1f} / {result['max_rtt']:.1f} ms"
+        self.overall_heading = f"{heading}Overall Statistics:{reset}"
+        self.continent_heading = f"\n{heading}Statistics by Continent:{reset}"
+        self.nodes_heading = f"\n{heading}Detailed Results by Node:{reset}"
+        self.rate_line = "{indent}Success Rate: {color}{successful}/{total}" + reset
+        
+        if check_type == "ping":
+            self.title = "PING RESULTS SUMMARY"
+            self.stats_lines = ("{indent}Average RTT: {avg_rtt:.1f} ms\n"
+                                "{indent}Min/Max RTT: {min_rtt:.1f} ms / {max_rtt:.1f} ms")
+            self.nodes_header = f"{'Location':<30} {'Result':<10} {'RTT min/avg/max':<25} {'IP Address':<15}"
+            self.node_row = "%-30s %s%-10s" + reset.replace("%", "%%") + " %-25s %-15s"
         else:
-            rtt_stats = "N/A"
+            self.title = "HTTP RESULTS SUMMARY"
+            self.stats_lines = "{indent}Average Response Time: {avg_response_time:.1f} ms"
+            self.nodes_header = f"{'Location':<30} {'Status':<15} {'Response Time':<15} {'IP Address':<15}"
+            self.node_row = "%-30s %s%-15s" + reset.replace("%", "%%") + " %-15s %-15s"
+        self.banner = f"\n{'=' * 80}\n{Fore.CYAN if color else ''}{self.title}{reset}\n{'=' * 80}\n\n"
+    
+    @classmethod
+    def get(cls, check_type: str, color: bool = True) -> "ResultRenderer":
+        """Return the shared renderer of a check type, compiling it on first use."""
+        key = (check_type, color)
+        renderer = cls._cache.get(key)
+        if renderer is None:
+            renderer = cls._cache[key] = cls(check_type, color)
+        return renderer
+    
+    @staticmethod
+    def sort_nodes(nodes_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order node results by continent, country and city using the registry order."""
+        last = len(NODE_ORDER)
+        return sorted(nodes_results, key=lambda result: NODE_ORDER.get(result.get("node"), last))
+    
+    def _stats(self, lines: List[str], indent: str, stats: Dict[str, Any]) -> None:
+        """Append the success rate and latency lines of one statistics block."""
+        successful = stats.get("successful", 0)
+        total = stats.get("total", 0)
+        lines.append(self.rate_line.format(
+            indent=indent, color=self.good if successful == total else self.bad,
+            successful=successful, total=total
+        ))
+        if successful > 0:
+            lines.append(self.stats_lines.format(
+                indent=indent,
+                avg_rtt=stats.get("avg_rtt", 0), min_rtt=stats.get("min_rtt", 0), max_rtt=stats.get("max_rtt", 0),
+                avg_response_time=stats.get("avg_response_time", 0)
+            ))
+    
+    def render(self, parsed_results: Dict[str, Any], banner: bool = True) -> str:
+        """
+        Render the statistics and node table of parsed results.
+        
+        Args:
+            parsed_results: Parsed ping or HTTP results
+            banner: Whether to start with the results summary banner
             
-        print(f"{location:<30} {success_color}{success_ratio:<10}{Style.RESET_ALL} {rtt_stats:<25} {result['ip']:<15}")
+        Returns:
+            The rendered text, ending with a newline
+        """
+        lines = [self.banner + self.overall_heading if banner else self.overall_heading]
+        self._stats(lines, "  ", parsed_results.get("overall_stats", {}))
+        
+        lines.append(self.continent_heading)
+        for continent, stats in parsed_results.get("continent_stats", {}).items():
+            lines.append(f"  {continent}:")
+            self._stats(lines, "    ", stats)
+        
+        lines.append(self.nodes_heading)
+        lines.append(self.nodes_header)
+        lines.append("-" * 80)
+        
+        # Rows use positional %-formatting, the cheapest way to fill a fixed layout
+        row = self.node_row
+        good, bad = self.good, self.bad
+        append = lines.append
+        if self.check_type == "ping":
+            for result in self.sort_nodes(parsed_results.get("nodes_results", [])):
+                successful = result["successful"]
+                total = result["total"]
+                append(row % (
+                    result["country"] + ", " + result["city"],
+                    good if successful == total else bad,
+                    "%d/%d" % (successful, total),
+                    "%.1f / %.1f / %.1f ms" % (result["min_rtt"], result["avg_rtt"], result["max_rtt"])
+                    if successful > 0 else "N/A",
+                    result["ip"]
+                ))
+        else:
+            for result in self.sort_nodes(parsed_results.get("nodes_results", [])):
+                success = result["success"]
+                append(row % (
+                    result["country"] + ", " + result["city"],
+                    good if success else bad,
+                    "%s %s" % (result["status_code"], result["status_msg"]),
+                    "%.1f ms" % result["response_time"] if success else "N/A",
+                    result["ip"]
+                ))
+        
+        lines.append("")
+        return "\n".join(lines)
+
+
+def display_ping_results(parsed_results: Dict[str, Any]) -> None:
+    """
+    Display ping results in a formatted table.
+    
+    Args:
+        parsed_results: Parsed ping results
+    """
+    sys.stdout.write(ResultRenderer.get("ping").render(parsed_results))
 
 
 def display_http_results(parsed_results: Dict[str, Any]) -> None:
@@ -493,51 +1166,314 @@ def display_http_results(parsed_results: Dict[str, Any]) -> None:
     Args:
         parsed_results: Parsed HTTP results
     """
-    print("\n" + "=" * 80)
-    print(f"{Fore.CYAN}HTTP RESULTS SUMMARY{Style.RESET_ALL}")
-    print("=" * 80)
+    sys.stdout.write(ResultRenderer.get("http").render(parsed_results))
+
+
+class LatencyBaseline:
+    """Streaming per-(host, node) latency baselines used to flag anomalies.
     
-    # Overall statistics
-    overall = parsed_results["overall_stats"]
-    success_ratio = f"{overall['successful']}/{overall['total']}"
-    success_color = Fore.GREEN if overall['successful'] == overall['total'] else Fore.RED
+    Every baseline is an exponentially weighted mean and variance stored as
+    [samples, mean, variance, consecutive anomalies], so an update costs O(1)
+    and thousands of host/node pairs stay small enough to persist as a single
+    JSON file.
+    Ping checks track the average RTT of a node, HTTP checks its response time.
+    """
     
-    print(f"\n{Fore.YELLOW}Overall Statistics:{Style.RESET_ALL}")
-    print(f"  Success Rate: {success_color}{success_ratio}{Style.RESET_ALL}")
-    if overall['successful'] > 0:
-        print(f"  Average Response Time: {overall['avg_response_time']:.1f} ms")
+    METRICS = {"ping": "avg_rtt", "http": "response_time"}
     
-    # Continent statistics
-    print(f"\n{Fore.YELLOW}Statistics by Continent:{Style.RESET_ALL}")
-    for continent, stats in parsed_results["continent_stats"].items():
-        success_ratio = f"{stats['successful']}/{stats['total']}"
-        success_color = Fore.GREEN if stats['successful'] == stats['total'] else Fore.RED
-        
-        print(f"  {continent}:")
-        print(f"    Success Rate: {success_color}{success_ratio}{Style.RESET_ALL}")
-        if stats['successful'] > 0:
-            print(f"    Average Response Time: {stats['avg_response_time']:.1f} ms")
-    
-    # Detailed node results
-    print(f"\n{Fore.YELLOW}Detailed Results by Node:{Style.RESET_ALL}")
-    print(f"{'Location':<30} {'Status':<15} {'Response Time':<15} {'IP Address':<15}")
-    print("-" * 80)
-    
-    # Sort by continent and then by country
-    sorted_results = sorted(
-        parsed_results["nodes_results"], 
-        key=lambda x: (x["continent"], x["country"], x["city"])
-    )
+    def __init__(self, alpha: float = 0.1, threshold: float = 4.0, min_samples: int = 5,
+                 min_stddev: float = 1.0, rebaseline_after: int = 5):
+        """
+        Initialize an empty set of baselines.
+        
+        Args:
+            alpha: Weight of the newest sample in the moving averages
+            threshold: Number of standard deviations above the mean flagged as anomalous
+            min_samples: Samples a baseline needs before it can flag anomalies
+            min_stddev: Lower bound of the standard deviation in ms, so very stable nodes do not flag jitter
+            rebaseline_after: Consecutive anomalous samples after which a baseline starts over
+        """
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.min_stddev = min_stddev
+        self.rebaseline_after = rebaseline_after
+        self.baselines: Dict[str, Dict[str, List[float]]] = {}
     
-    for result in sorted_results:
-        location = f"{result['country']}, {result['city']}"
+    def update(self, check_type: str, host: str, node: str, value: float) -> Optional[float]:
+        """
+        Add a sample to a baseline.
+        
+        Samples flagged as anomalous are clamped to the threshold before they
+        are averaged in, so a single spike moves the baseline by a bounded
+        amount. Once rebaseline_after samples in a row were flagged, the
+        latency is taken as the new normal and the baseline starts over from
+        the latest sample.
+        
+        Args:
+            check_type: Type of check the sample comes from ('ping' or 'http')
+            host: Host that was checked
+            node: Node that measured the sample
+            value: Latency in ms
+            
+        Returns:
+            Deviation of the sample from the baseline in standard deviations,
+            or None while the baseline is warming up
+        """
+        nodes = self.baselines.setdefault(f"{check_type} {host}", {})
+        state = nodes.get(node)
+        if state is None:
+            nodes[node] = [1, value, 0.0, 0]
+            return None
         
-        status = f"{result['status_code']} {result['status_msg']}"
-        status_color = Fore.GREEN if result['success'] else Fore.RED
+        # Baselines saved before the anomaly count was added have three fields
+        samples, mean, variance = state[:3]
+        streak = 0
+        score = None
+        if samples >= self.min_samples:
+            stddev = max(variance ** 0.5, self.min_stddev)
+            score = (value - mean) / stddev
+            if score >= self.threshold:
+                streak = (state[3] if len(state) > 3 else 0) + 1
+                if streak >= self.rebaseline_after:
+                    nodes[node] = [1, value, 0.0, 0]
+                    return score
+                value = mean + self.threshold * stddev
         
-        response_time = f"{result['response_time']:.1f} ms" if result['success'] else "N/A"
+        # Plain averages until 1 / alpha samples were seen, EWMA afterwards
+        alpha = max(self.alpha, 1 / (samples + 1))
+        diff = value - mean
+        increment = alpha * diff
+        state[:] = [samples + 1, mean + increment, (1 - alpha) * (variance + diff * increment), streak]
+        return score
+    
+    def observe(self, check_type: str, host: str, parsed_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Update the baselines from parsed results and return the anomalous nodes.
         
-        print(f"{location:<30} {status_color}{status:<15}{Style.RESET_ALL} {response_time:<15} {result['ip']:<15}")
+        Args:
+            check_type: Type of check the results come from
+            host: Host that was checked
+            parsed_results: Parsed ping or HTTP results
+            
+        Returns:
+            One entry per node whose latency is above its baseline threshold
+        """
+        metric = self.METRICS.get(check_type)
+        if metric is None:
+            return []
+        
+        anomalies = []
+        for result in parsed_results.get("nodes_results", []):
+            if not result.get("successful", result.get("success")):
+                continue
+            
+            value = result[metric]
+            mean = self.baselines.get(f"{check_type} {host}", {}).get(result["node"], [0, 0.0])[1]
+            score = self.update(check_type, host, result["node"], value)
+            if score is not None and score >= self.threshold:
+                anomalies.append({
+                    "node": result["node"],
+                    "country": result["country"],
+                    "city": result["city"],
+                    "continent": result["continent"],
+                    "value": value,
+                    "baseline": mean,
+                    "sigma": score
+                })
+        
+        return anomalies
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the baselines in their persisted layout."""
+        return {"alpha": self.alpha, "baselines": self.baselines}
+    
+    def save(self, filename: str) -> None:
+        """Write the baselines to a compact JSON file."""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+    
+    @classmethod
+    def load(cls, filename: str, **kwargs: Any) -> "LatencyBaseline":
+        """
+        Load baselines from a file, starting empty if it does not exist yet.
+        
+        Args:
+            filename: File written by save
+            **kwargs: Detection settings passed to the constructor
+            
+        Returns:
+            Baselines read from the file
+        """
+        baseline = cls(**kwargs)
+        if os.path.exists(filename):
+            with open(filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            baseline.alpha = data.get("alpha", baseline.alpha)
+            baseline.baselines = data.get("baselines", {})
+        return baseline
+
+
+def display_anomalies(anomalies: List[Dict[str, Any]], check_type: str, threshold: float) -> None:
+    """
+    Display anomalous nodes grouped by continent.
+    
+    Args:
+        anomalies: Anomalies returned by LatencyBaseline.observe
+        check_type: Type of check the anomalies come from
+        threshold: Threshold in standard deviations used for detection
+    """
+    if not anomalies:
+        return
+    
+    label = "RTT" if check_type == "ping" else "Response time"
+    by_continent = defaultdict(list)
+    for anomaly in anomalies:
+        by_continent[anomaly["continent"]].append(anomaly)
+    
+    print(f"\n{Fore.RED}Latency Anomalies:{Style.RESET_ALL}")
+    for continent, items in by_continent.items():
+        print(f"  {Fore.RED}{label} {threshold:g}σ above baseline from {len(items)} {continent} "
+              f"node{'s' if len(items) != 1 else ''}{Style.RESET_ALL}")
+        for anomaly in sorted(items, key=lambda x: -x["sigma"]):
+            location = f"{anomaly['country']}, {anomaly['city']}"
+            print(f"    {location:<30} {anomaly['value']:.1f} ms (baseline {anomaly['baseline']:.1f} ms, "
+                  f"{anomaly['sigma']:.1f}σ)")
+
+
+def build_comparison(check_type: str, parsed_by_host: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Align the parsed results of several hosts per node and per continent.
+    
+    Every node result is visited once: its latency goes into the node row and
+    the per-host continent sums. Hosts are visited in order, so the reference
+    value of a node is already known when another host's value arrives, and
+    its delta is added to the continent deltas right away.
+    
+    Args:
+        check_type: Either 'ping' or 'http'
+        parsed_by_host: Parsed results keyed by host, the first host is the reference
+        
+    Returns:
+        Comparison with one row per node and latency averages and deltas per continent
+    """
+    metric = LatencyBaseline.METRICS[check_type]
+    hosts = list(parsed_by_host)
+    rows: Dict[str, Dict[str, Any]] = {}
+    continents: Dict[str, Dict[str, Any]] = {}
+    
+    for index, host in enumerate(hosts):
+        for result in parsed_by_host[host].get("nodes_results", []):
+            node = result["node"]
+            row = rows.get(node)
+            if row is None:
+                row = rows[node] = {
+                    "node": node,
+                    "country": result["country"],
+                    "city": result["city"],
+                    "continent": result["continent"],
+                    "values": [None] * len(hosts)
+                }
+            continent = continents.get(result["continent"])
+            if continent is None:
+                continent = continents[result["continent"]] = {
+                    "sums": [0.0] * len(hosts),
+                    "counts": [0] * len(hosts),
+                    "delta_sums": [0.0] * len(hosts),
+                    "delta_counts": [0] * len(hosts)
+                }
+            
+            if not result.get("successful", result.get("success")):
+                continue
+            value = result[metric]
+            values = row["values"]
+            values[index] = value
+            continent["sums"][index] += value
+            continent["counts"][index] += 1
+            
+            # Pair this value with the reference host, which was visited first
+            if index > 0 and values[0] is not None:
+                continent["delta_sums"][index] += value - values[0]
+                continent["delta_counts"][index] += 1
+    
+    continent_stats = {}
+    for name, continent in continents.items():
+        continent_stats[name] = {
+            "avg": [total / count if count else None
+                    for total, count in zip(continent["sums"], continent["counts"])],
+            "delta": [total / count if count else None
+                      for total, count in zip(continent["delta_sums"], continent["delta_counts"])],
+            "nodes": continent["counts"]
+        }
+    
+    return {
+        "check_type": "compare",
+        "compared_check_type": check_type,
+        "hosts": hosts,
+        "nodes": ResultRenderer.sort_nodes(list(rows.values())),
+        "continent_stats": continent_stats
+    }
+
+
+def render_comparison(comparison: Dict[str, Any], color: bool = True) -> str:
+    """
+    Render a comparison as an aligned node matrix followed by continent deltas.
+    
+    Args:
+        comparison: Comparison returned by build_comparison
+        color: Whether to include terminal color codes
+        
+    Returns:
+        The rendered text, ending with a newline
+    """
+    hosts = comparison["hosts"]
+    reset = Style.RESET_ALL if color else ""
+    heading = Fore.YELLOW if color else ""
+    faster = Fore.GREEN if color else ""
+    slower = Fore.RED if color else ""
+    width = max(12, *(len(host) + 2 for host in hosts))
+    label = "RTT" if comparison["compared_check_type"] == "ping" else "Response Time"
+    
+    def cell(value: Optional[float]) -> str:
+        return f"{value:.1f} ms" if value is not None else "N/A"
+    
+    def delta_cell(value: Optional[float]) -> str:
+        if value is None:
+            return f"{'N/A':<{width}}"
+        text = f"{value:+.1f} ms"
+        return f"{faster if value < 0 else slower if value > 0 else ''}{text:<{width}}{reset}"
+    
+    host_columns = " ".join(f"{host:<{width}}" for host in hosts)
+    delta_columns = " ".join(f"{'Δ ' + host:<{width}}" for host in hosts[1:])
+    header = f"{'Location':<30} {host_columns} {delta_columns}".rstrip()
+    
+    lines = [
+        f"\n{'=' * 80}\n{Fore.CYAN if color else ''}{comparison['compared_check_type'].upper()} "
+        f"COMPARISON ({label}, Δ against {hosts[0]}){reset}\n{'=' * 80}\n",
+        f"{heading}Statistics by Continent:{reset}",
+        f"{'Continent':<30} {host_columns} {delta_columns}".rstrip(),
+        "-" * len(header)
+    ]
+    for continent, stats in comparison["continent_stats"].items():
+        averages = " ".join(f"{cell(value):<{width}}" for value in stats["avg"])
+        deltas = " ".join(delta_cell(value) for value in stats["delta"][1:])
+        lines.append(f"{continent:<30} {averages} {deltas}".rstrip())
+    
+    lines.append(f"\n{heading}Detailed Results by Node:{reset}")
+    lines.append(header)
+    lines.append("-" * len(header))
+    for row in comparison["nodes"]:
+        values = row["values"]
+        location = f"{row['country']}, {row['city']}"
+        cells = " ".join(f"{cell(value):<{width}}" for value in values)
+        deltas = " ".join(
+            delta_cell(value - values[0] if value is not None and values[0] is not None else None)
+            for value in values[1:]
+        )
+        lines.append(f"{location:<30} {cells} {deltas}".rstrip())
+    
+    lines.append("")
+    return "\n".join(lines)
 
 
 def save_results_to_file(data: Dict[str, Any], filename: str, format_type: str = "json") -> None:
@@ -547,8 +1483,17 @@ def save_results_to_file(data: Dict[str, Any], filename: str, format_type: str =
     Args:
         data: Results data to save
         filename: Output filename
-        format_type: Format to save in ('json' or 'txt')
+        format_type: Format to save in ('json', 'txt' or 'archive')
     """
+    if format_type == "archive":
+        filename = filename or ResultArchive.DEFAULT_FILENAME
+        try:
+            ResultArchive(filename).append([data])
+            print(f"{Fore.GREEN}Results appended to archive {filename}")
+        except Exception as e:
+            print(f"{Fore.RED}Error saving results to archive: {e}")
+        return
+    
     if not filename:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         check_type = data.get("check_type", "check")
@@ -563,55 +1508,320 @@ def save_results_to_file(data: Dict[str, Any], filename: str, format_type: str =
                 f.write(f"Check Type: {data.get('check_type', 'unknown')}\n")
                 f.write(f"Host: {data.get('host', 'unknown')}\n")
                 f.write(f"Timestamp: {data.get('timestamp', datetime.now().isoformat())}\n\n")
-                
-                # Overall stats
-                f.write("Overall Statistics:\n")
-                overall = data.get("overall_stats", {})
-                f.write(f"  Success Rate: {overall.get('successful', 0)}/{overall.get('total', 0)}\n")
-                if data.get("check_type") == "ping":
-                    f.write(f"  Average RTT: {overall.get('avg_rtt', 0):.1f} ms\n")
-                    f.write(f"  Min/Max RTT: {overall.get('min_rtt', 0):.1f} ms / {overall.get('max_rtt', 0):.1f} ms\n")
-                else:
-                    f.write(f"  Average Response Time: {overall.get('avg_response_time', 0):.1f} ms\n")
-                
-                # Continent stats
-                f.write("\nStatistics by Continent:\n")
-                for continent, stats in data.get("continent_stats", {}).items():
-                    f.write(f"  {continent}:\n")
-                    f.write(f"    Success Rate: {stats.get('successful', 0)}/{stats.get('total', 0)}\n")
-                    if data.get("check_type") == "ping":
-                        f.write(f"    Average RTT: {stats.get('avg_rtt', 0):.1f} ms\n")
-                        f.write(f"    Min/Max RTT: {stats.get('min_rtt', 0):.1f} ms / {stats.get('max_rtt', 0):.1f} ms\n")
-                    else:
-                        f.write(f"    Average Response Time: {stats.get('avg_response_time', 0):.1f} ms\n")
-                
-                # Node results
-                f.write("\nDetailed Results by Node:\n")
-                if data.get("check_type") == "ping":
-                    for result in data.get("nodes_results", []):
-                        location = f"{result.get('country', 'Unknown')}, {result.get('city', 'Unknown')}"
-                        success_ratio = f"{result.get('successful', 0)}/{result.get('total', 0)}"
-                        if result.get('successful', 0) > 0:
-                            rtt_stats = f"{result.get('min_rtt', 0):.1f} / {result.get('avg_rtt', 0):.1f} / {result.get('max_rtt', 0):.1f} ms"
-                        else:
-                            rtt_stats = "N/A"
-                        f.write(f"{location:<30} {success_ratio:<10} {rtt_stats:<25} {result.get('ip', 'N/A'):<15}\n")
-                else:
-                    f.write(f"{'Location':<30} {'Status':<15} {'Response Time':<15} {'IP Address':<15}\n")
-                    f.write("-" * 80 + "\n")
-                    
-                    for result in data.get("nodes_results", []):
-                        location = f"{result.get('country', 'Unknown')}, {result.get('city', 'Unknown')}"
-                        status = f"{result.get('status_code', 'N/A')} {result.get('status_msg', 'N/A')}"
-                        response_time = f"{result.get('response_time', 0):.1f} ms" if result.get('success', False) else "N/A"
-                        
-                        f.write(f"{location:<30} {status:<15} {response_time:<15} {result.get('ip', 'N/A'):<15}\n")
+                f.write(ResultRenderer.get(data.get("check_type", "http"), color=False).render(data, banner=False))
         
         print(f"{Fore.GREEN}Results saved to {filename}")
     except Exception as e:
         print(f"{Fore.RED}Error saving results to file: {e}")
 
 
+class ResultArchive:
+    """Append-only archive of check results stored as gzip-compressed NDJSON chunks.
+    
+    The data file is a sequence of chunks holding up to CHUNK_SIZE results
+    each, every chunk being one or more concatenated gzip members. A sidecar
+    index (<archive>.idx) lists the byte range, hosts, check types and time
+    range of every chunk, so readers only decompress the chunks a query can
+    match, reading them through mmap.
+    
+    Writers only ever add bytes past the indexed data and then atomically
+    replace the index, so an interrupted append leaves the archive readable.
+    """
+    
+    CHUNK_SIZE = 256
+    INDEX_VERSION = 1
+    DEFAULT_FILENAME = "check_results.chk"
+    
+    def __init__(self, filename: str):
+        """
+        Open an archive, creating nothing until results are appended.
+        
+        Args:
+            filename: Path of the archive data file
+        """
+        self.filename = filename
+        self.index_filename = f"{filename}.idx"
+        self.lock_filename = f"{filename}.lock"
+        self.chunks: List[Dict[str, Any]] = []
+        self._read_index()
+    
+    def _read_index(self) -> None:
+        """Load the chunk list from the sidecar index, if there is one."""
+        if os.path.exists(self.index_filename):
+            with open(self.index_filename, 'r', encoding='utf-8') as f:
+                self.chunks = json.load(f).get("chunks", [])
+    
+    def append(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Append results to the archive.
+        
+        New results first fill up a trailing chunk that is not full yet, as
+        an extra gzip member behind its existing bytes, so archives grown one
+        run at a time do not end up with one chunk per run.
+        
+        Args:
+            records: Results in the layout written by save_results_to_file
+        """
+        records = list(records)
+        if not records:
+            return
+        
+        with self._lock():
+            # Another writer may have appended since this archive was opened
+            self._read_index()
+            chunks = [dict(chunk) for chunk in self.chunks]
+            end = chunks[-1]["offset"] + chunks[-1]["length"] if chunks else 0
+            
+            fd = os.open(self.filename, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+            with os.fdopen(fd, 'r+b') as f:
+                # Bytes past the indexed data belong to an interrupted append
+                f.truncate(end)
+                f.seek(end)
+                
+                if chunks and chunks[-1]["records"] < self.CHUNK_SIZE:
+                    fill = self.CHUNK_SIZE - chunks[-1]["records"]
+                    self._write_chunk(f, chunks[-1], records[:fill])
+                    records = records[fill:]
+                
+                for start in range(0, len(records), self.CHUNK_SIZE):
+                    chunk = {"offset": f.tell(), "length": 0, "records": 0,
+                             "hosts": [], "check_types": [], "start": None, "end": None}
+                    self._write_chunk(f, chunk, records[start:start + self.CHUNK_SIZE])
+                    chunks.append(chunk)
+                
+                f.flush()
+                os.fsync(f.fileno())
+            
+            self.chunks = chunks
+            self._write_index()
+    
+    @staticmethod
+    def _write_chunk(f: Any, chunk: Dict[str, Any], records: List[Dict[str, Any]]) -> None:
+        """Write records as one gzip member at the current position and extend a chunk entry with them."""
+        data = gzip.compress(
+            b"".join(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n" for record in records)
+        )
+        f.write(data)
+        timestamps = [record.get("timestamp", "") for record in records]
+        if chunk["start"] is not None:
+            timestamps += [chunk["start"], chunk["end"]]
+        chunk["length"] += len(data)
+        chunk["records"] += len(records)
+        chunk["hosts"] = sorted(set(chunk["hosts"]) | {record.get("host", "") for record in records})
+        chunk["check_types"] = sorted(set(chunk["check_types"]) | {record.get("check_type", "") for record in records})
+        chunk["start"] = min(timestamps)
+        chunk["end"] = max(timestamps)
+    
+    @contextlib.contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the archive for the duration of a write."""
+        with open(self.lock_filename, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            elif msvcrt:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                elif msvcrt:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    def query(self, host: Optional[str] = None, check_type: Optional[str] = None,
+              since: Optional[str] = None, until: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Read the results matching every given filter.
+        
+        Args:
+            host: Only results for this host
+            check_type: Only results of this check type
+            since: Only results with an ISO timestamp at or after this one
+            until: Only results with an ISO timestamp at or before this one
+            
+        Returns:
+            Matching results in archive order
+        """
+        chunks = [
+            chunk for chunk in self.chunks
+            if (host is None or host in chunk["hosts"])
+            and (check_type is None or check_type in chunk["check_types"])
+            and (since is None or chunk["end"] >= since)
+            and (until is None or chunk["start"] <= until)
+        ]
+        if not chunks:
+            return []
+        
+        matches = []
+        with open(self.filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for chunk in chunks:
+                for record in self._decode(data[chunk["offset"]:chunk["offset"] + chunk["length"]]):
+                    timestamp = record.get("timestamp", "")
+                    if ((host is None or record.get("host") == host)
+                            and (check_type is None or record.get("check_type") == check_type)
+                            and (since is None or timestamp >= since)
+                            and (until is None or timestamp <= until)):
+                        matches.append(record)
+        return matches
+    
+    @staticmethod
+    def _decode(data: bytes) -> List[Dict[str, Any]]:
+        """Decompress and parse one chunk."""
+        return [json.loads(line) for line in gzip.decompress(data).splitlines() if line]
+    
+    def _write_index(self) -> None:
+        """Atomically replace the sidecar index."""
+        temp_filename = f"{self.index_filename}.tmp"
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            json.dump({"version": self.INDEX_VERSION, "chunks": self.chunks}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_filename, self.index_filename)
+
+
+def load_txt_results(filename: str) -> Dict[str, Any]:
+    """
+    Read results back from a txt file written by save_results_to_file.
+    
+    Node names are recovered from the country and city of each line, raw
+    results are not part of the txt format and are left empty.
+    
+    Args:
+        filename: Txt results file
+        
+    Returns:
+        Results in the layout written by save_results_to_file
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    
+    data = {"raw_results": {}, "nodes_results": [], "continent_stats": {}, "overall_stats": {}}
+    nodes_by_location = defaultdict(list)
+    for node, detail in NODE_DETAILS.items():
+        nodes_by_location[(detail["country"], detail["city"])].append(node)
+    
+    section = None
+    stats = None
+    for line in lines:
+        if not line.strip() or line.startswith("-" * 10) or line.startswith("Location "):
+            continue
+        
+        header = re.match(r"^(Check Type|Host|Timestamp): (.*)$", line)
+        if header:
+            data[header.group(1).lower().replace(" ", "_")] = header.group(2)
+            continue
+        if line == "Overall Statistics:":
+            section, stats = "overall", data["overall_stats"]
+            continue
+        if line == "Statistics by Continent:":
+            section = "continent"
+            continue
+        if line == "Detailed Results by Node:":
+            section = "nodes"
+            continue
+        
+        if section == "continent" and re.match(r"^  \S+:$", line):
+            stats = data["continent_stats"].setdefault(line.strip()[:-1], {})
+        elif section in ("overall", "continent"):
+            match = re.search(r"Success Rate: (\d+)/(\d+)", line)
+            if match:
+                stats["successful"], stats["total"] = int(match.group(1)), int(match.group(2))
+            match = re.search(r"Average RTT: ([\d.]+) ms", line)
+            if match:
+                stats["avg_rtt"] = float(match.group(1))
+            match = re.search(r"Min/Max RTT: ([\d.]+) ms / ([\d.]+) ms", line)
+            if match:
+                stats["min_rtt"], stats["max_rtt"] = float(match.group(1)), float(match.group(2))
+            match = re.search(r"Average Response Time: ([\d.]+) ms", line)
+            if match:
+                stats["avg_response_time"] = float(match.group(1))
+        elif section == "nodes":
+            result = _parse_txt_node_line(line, data.get("check_type"))
+            if result is None:
+                continue
+            country, _, city = result.pop("location").partition(", ")
+            candidates = nodes_by_location.get((country, city)) or ["unknown"]
+            node = candidates.pop(0) if len(candidates) > 1 else candidates[0]
+            result.update({
+                "node": node,
+                "country": country,
+                "city": city,
+                "continent": NODE_DETAILS.get(node, {}).get("continent", "Unknown")
+            })
+            data["nodes_results"].append(result)
+    
+    return data
+
+
+def _parse_txt_node_line(line: str, check_type: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Parse one line of the detailed node section of a txt results file."""
+    if check_type == "ping":
+        match = re.match(
+            r"^(?P<location>.+?)\s+(?P<successful>\d+)/(?P<total>\d+)\s+"
+            r"(?:N/A|(?P<min>[\d.]+) / (?P<avg>[\d.]+) / (?P<max>[\d.]+) ms)\s+(?P<ip>\S+)\s*$",
+            line
+        )
+        if not match:
+            return None
+        return {
+            "location": match.group("location"),
+            "successful": int(match.group("successful")),
+            "total": int(match.group("total")),
+            "min_rtt": float(match.group("min") or 0),
+            "avg_rtt": float(match.group("avg") or 0),
+            "max_rtt": float(match.group("max") or 0),
+            "ip": match.group("ip")
+        }
+    
+    match = re.match(
+        r"^(?P<location>.+?)\s{2,}(?P<code>\S+) (?P<msg>.*?)\s+(?:N/A|(?P<time>[\d.]+) ms)\s+(?P<ip>\S+)\s*$",
+        line
+    )
+    if not match:
+        return None
+    # Status codes stay strings as in the API, missing values come back as None
+    missing = ("None", "N/A")
+    return {
+        "location": match.group("location"),
+        "success": match.group("time") is not None,
+        "response_time": float(match.group("time") or 0),
+        "status_msg": match.group("msg"),
+        "status_code": None if match.group("code") in missing else match.group("code"),
+        "ip": None if match.group("ip") in missing else match.group("ip")
+    }
+
+
+def import_results_to_archive(filenames: List[str], archive_filename: str) -> None:
+    """
+    Convert json and txt result files into an archive.
+    
+    Args:
+        filenames: Files written by save_results_to_file
+        archive_filename: Archive to append the results to
+    """
+    records = []
+    for filename in filenames:
+        try:
+            if filename.endswith(".txt"):
+                record = load_txt_results(filename)
+            else:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+            if not isinstance(record, dict):
+                raise ValueError("not a result object")
+            if record.get("check_type") == "compare":
+                raise ValueError("compare results have no single host to archive")
+            records.append(record)
+        except (OSError, ValueError) as e:
+            print(f"{Fore.RED}Skipping {filename}: {e}{Style.RESET_ALL}")
+    
+    records.sort(key=lambda record: record.get("timestamp", ""))
+    ResultArchive(archive_filename).append(records)
+    print(f"{Fore.GREEN}Imported {len(records)} results into {archive_filename}{Style.RESET_ALL}")
+
+
 def interactive_mode() -> None:
     """Run the program in interactive mode, prompting for inputs."""
     while True:
@@ -666,8 +1876,8 @@ def interactive_mode() -> None:
             save_to_file = save_option in ["y", "yes"]
             
             if save_to_file:
-                format_type = input(f"{Fore.YELLOW}Save format (json/txt) [default: json]: {Style.RESET_ALL}").lower() or "json"
-                if format_type not in ["json", "txt"]:
+                format_type = input(f"{Fore.YELLOW}Save format (json/txt/archive) [default: json]: {Style.RESET_ALL}").lower() or "json"
+                if format_type not in ["json", "txt", "archive"]:
                     format_type = "json"
                     print(f"{Fore.YELLOW}Invalid format. Using json instead.{Style.RESET_ALL}")
                 
@@ -684,7 +1894,8 @@ def interactive_mode() -> None:
 
 def run_check_and_display(check_type: str, host: str, nodes: List[str], 
                           save_to_file: bool = False, filename: Optional[str] = None,
-                          format_type: str = "json") -> None:
+                          format_type: str = "json", baseline: Optional[LatencyBaseline] = None,
+                          api: Optional[CheckHostAPI] = None) -> None:
     """
     Run a check and display results.
     
@@ -694,9 +1905,11 @@ def run_check_and_display(check_type: str, host: str, nodes: List[str],
         nodes: List of nodes to use
         save_to_file: Whether to save results to file
         filename: Filename to save to (or None for auto-generated)
-        format_type: Format to save in ('json' or 'txt')
+        format_type: Format to save in ('json', 'txt' or 'archive')
+        baseline: Latency baselines to update and check for anomalies
+        api: API client to use (or None for a new one)
     """
-    api = CheckHostAPI()
+    api = api or CheckHostAPI()
     
     print(f"\n{Fore.CYAN}Running {check_type} check on {host} using {len(nodes)} nodes...{Style.RESET_ALL}")
     
@@ -713,12 +1926,11 @@ def run_check_and_display(check_type: str, host: str, nodes: List[str],
         results = api.get_check_result(request_id)
         
         # Parse and display results
+        full_results = build_full_results(check_type, host, check_response, results)
         if check_type == "ping":
-            parsed_results = parse_ping_results(results)
-            display_ping_results(parsed_results)
+            display_ping_results(full_results)
         elif check_type == "http":
-            parsed_results = parse_http_results(results)
-            display_http_results(parsed_results)
+            display_http_results(full_results)
         else:
             # For TCP, UDP, and DNS tests, just show raw results
             print("\n" + "=" * 80)
@@ -726,27 +1938,388 @@ def run_check_and_display(check_type: str, host: str, nodes: List[str],
             print("=" * 80)
             print(json.dumps(results, indent=2))
         
-        # Add metadata
+        # Compare against the latency baselines
+        if baseline is not None and check_type in LatencyBaseline.METRICS:
+            full_results["anomalies"] = baseline.observe(check_type, host, full_results)
+            display_anomalies(full_results["anomalies"], check_type, baseline.threshold)
+        
+        # Save to file if requested
+        if save_to_file:
+            save_results_to_file(full_results, filename, format_type)
+            
+    except Exception as e:
+        print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
+        sys.exit(1)
+
+
+def compare_and_display(check_type: str, hosts: List[str], nodes: List[str],
+                        save_to_file: bool = False, filename: Optional[str] = None,
+                        format_type: str = "json", baseline: Optional[LatencyBaseline] = None,
+                        api: Optional[CheckHostAPI] = None, timeout: int = 30) -> None:
+    """
+    Run the same check against several hosts at once and display them side by side.
+    
+    Args:
+        check_type: Type of check to run ('ping' or 'http')
+        hosts: Hosts to compare, the first one is the reference for deltas
+        nodes: List of nodes to use
+        save_to_file: Whether to save results to file
+        filename: Filename to save to (or None for auto-generated)
+        format_type: Format to save in ('json', 'txt' or 'archive')
+        baseline: Latency baselines to update and check for anomalies
+        api: API client to use (or None for a new one)
+        timeout: Maximum time to wait for results in seconds
+    """
+    if check_type not in LatencyBaseline.METRICS:
+        print(f"{Fore.RED}Error: Compare mode supports ping and http checks only{Style.RESET_ALL}")
+        sys.exit(1)
+    if len(hosts) < 2 or len(set(hosts)) != len(hosts):
+        print(f"{Fore.RED}Error: Compare mode needs at least two different hosts{Style.RESET_ALL}")
+        sys.exit(1)
+    
+    api = api or CheckHostAPI()
+    poller = ResultPoller(api)
+    
+    print(f"\n{Fore.CYAN}Running {check_type} check on {', '.join(hosts)} using {len(nodes)} nodes...{Style.RESET_ALL}")
+    
+    try:
+        # Submit every check at once so all hosts are measured at the same moment
+        with ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+            check_responses = list(executor.map(lambda host: api.run_check(check_type, host, nodes), hosts))
+        
+        futures = []
+        for host, check_response in zip(hosts, check_responses):
+            print(f"{Fore.GREEN}{host}: Request ID {check_response.get('request_id')}, "
+                  f"{check_response.get('permanent_link')}{Style.RESET_ALL}")
+            futures.append(poller.submit(check_response.get("request_id"), timeout=timeout))
+        
+        print(f"{Fore.CYAN}Fetching results (this may take a few seconds)...{Style.RESET_ALL}")
         full_results = {
-            "check_type": check_type,
-            "host": host,
-            "timestamp": datetime.now().isoformat(),
-            "permanent_link": check_response.get("permanent_link", ""),
-            "request_id": request_id,
-            "raw_results": results
+            host: build_full_results(check_type, host, check_response, future.result())
+            for host, check_response, future in zip(hosts, check_responses, futures)
         }
         
-        # For ping and http, add the parsed results
-        if check_type in ["ping", "http"]:
-            full_results.update(parsed_results)
+        comparison = build_comparison(check_type, full_results)
+        sys.stdout.write(render_comparison(comparison))
+        
+        if baseline is not None:
+            for host, results in full_results.items():
+                results["anomalies"] = baseline.observe(check_type, host, results)
+                if results["anomalies"]:
+                    print(f"\n{Fore.YELLOW}{host}:{Style.RESET_ALL}", end="")
+                    display_anomalies(results["anomalies"], check_type, baseline.threshold)
         
         # Save to file if requested
         if save_to_file:
-            save_results_to_file(full_results, filename, format_type)
-            
+            if format_type == "archive":
+                for results in full_results.values():
+                    save_results_to_file(results, filename, format_type)
+            elif format_type == "txt":
+                filename = filename or f"compare_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(f"Timestamp: {datetime.now().isoformat()}\n")
+                    f.write(render_comparison(comparison, color=False))
+                print(f"{Fore.GREEN}Results saved to {filename}")
+            else:
+                comparison["timestamp"] = datetime.now().isoformat()
+                comparison["results"] = full_results
+                save_results_to_file(comparison, filename, format_type)
+    
     except Exception as e:
         print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")
         sys.exit(1)
+    finally:
+        poller.stop()
+
+
+class CheckJob:
+    """A check submitted to the service, shared by every client asking for it."""
+    
+    def __init__(self, check_type: str, host: str, nodes: List[str]):
+        """
+        Initialize the job.
+        
+        Args:
+            check_type: Type of check to run
+            host: Host to check
+            nodes: List of nodes to use
+        """
+        self.id = uuid.uuid4().hex
+        self.check_type = check_type
+        self.host = host
+        self.nodes = nodes
+        self.status = "pending"
+        self.created = time.time()
+        self.finished = None
+        self.check_response = {}
+        self.raw_results = {}
+        self.results = None
+        self.error = None
+        self.version = 0
+        self.condition = threading.Condition()
+    
+    @property
+    def done(self) -> bool:
+        """Whether the job has reached a final state."""
+        return self.finished is not None
+    
+    def update(self, **fields: Any) -> None:
+        """Update job fields and wake up clients streaming this job."""
+        with self.condition:
+            # Set before the final status, so readers seeing it done always get a finish time
+            if fields.get("status") in ("done", "error") and self.finished is None:
+                self.finished = time.time()
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+            self.condition.notify_all()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a JSON serializable view of the job."""
+        with self.condition:
+            return {
+                "id": self.id,
+                "check_type": self.check_type,
+                "host": self.host,
+                "nodes": len(self.nodes),
+                "status": self.status,
+                "request_id": self.check_response.get("request_id"),
+                "permanent_link": self.check_response.get("permanent_link"),
+                "raw_results": self.raw_results,
+                "results": self.results,
+                "error": self.error
+            }
+
+
+class CheckService:
+    """Runs checks for many clients over one shared API client, cache and rate limit."""
+    
+    MAX_JOBS = 1000
+    
+    def __init__(self, api: CheckHostAPI, poller: ResultPoller, cache_ttl: float = 60,
+                 workers: int = 16, timeout: int = 30):
+        """
+        Initialize the service.
+        
+        Args:
+            api: Shared API client used for every check
+            poller: Shared poller collecting the results of every check
+            cache_ttl: Seconds a finished check is served from the cache
+            workers: Maximum number of checks being submitted at the same time
+            timeout: Maximum time to wait for the results of one check
+        """
+        self.api = api
+        self.poller = poller
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="check")
+        self.jobs: Dict[str, CheckJob] = {}
+        self.jobs_by_key: Dict[Tuple[str, str, Tuple[str, ...]], CheckJob] = {}
+        self.lock = threading.Lock()
+    
+    def submit(self, check_type: str, host: str, nodes: List[str]) -> Tuple[CheckJob, bool]:
+        """
+        Submit a check, reusing a running or recently finished identical one.
+        
+        Args:
+            check_type: Type of check to run
+            host: Host to check
+            nodes: List of nodes to use
+            
+        Returns:
+            Tuple of (job, whether the job was shared with an earlier request)
+        """
+        key = (check_type, host, tuple(sorted(nodes)))
+        with self.lock:
+            job = self.jobs_by_key.get(key)
+            if job:
+                with job.condition:
+                    reusable = job.status != "error" and (
+                        not job.done or time.time() - job.finished < self.cache_ttl)
+                if reusable:
+                    return job, True
+            
+            job = CheckJob(check_type, host, nodes)
+            self.jobs[job.id] = job
+            self.jobs_by_key[key] = job
+            self._prune()
+        
+        self.executor.submit(self._run, job)
+        return job, False
+    
+    def get(self, job_id: str) -> Optional[CheckJob]:
+        """Return a job by its ID, or None if it is unknown."""
+        with self.lock:
+            return self.jobs.get(job_id)
+    
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs once the job table is full."""
+        if len(self.jobs) <= self.MAX_JOBS:
+            return
+        finished = sorted((job for job in self.jobs.values() if job.done), key=lambda job: job.finished)
+        for job in finished[:len(self.jobs) - self.MAX_JOBS]:
+            del self.jobs[job.id]
+            key = (job.check_type, job.host, tuple(sorted(job.nodes)))
+            if self.jobs_by_key.get(key) is job:
+                del self.jobs_by_key[key]
+    
+    def _run(self, job: CheckJob) -> None:
+        """Submit a job and hand it over to the poller, publishing every partial result."""
+        try:
+            job.update(status="running")
+            check_response = self.api.run_check(job.check_type, job.host, job.nodes)
+            job.update(check_response=check_response)
+        except Exception as e:
+            job.update(status="error", error=str(e))
+            return
+        
+        future = self.poller.submit(
+            check_response.get("request_id"),
+            timeout=self.timeout,
+            on_update=lambda partial: job.update(raw_results=partial)
+        )
+        future.add_done_callback(lambda done: self._finish(job, done))
+    
+    def _finish(self, job: CheckJob, future: Future) -> None:
+        """Store the final results of a job once the poller resolved it."""
+        try:
+            results = future.result()
+            # Nothing to serve from the cache if no node answered before the timeout
+            if not any(value is not None for value in results.values()):
+                job.update(status="error", raw_results=results, error="No node answered before the timeout")
+                return
+            full_results = build_full_results(job.check_type, job.host, job.check_response, results)
+            job.update(status="done", raw_results=results, results=full_results)
+        except Exception as e:
+            job.update(status="error", error=str(e))
+    
+    def shutdown(self) -> None:
+        """Stop accepting work and resolve outstanding checks."""
+        self.executor.shutdown(wait=True)
+        self.poller.stop()
+
+
+class CheckServiceHandler(BaseHTTPRequestHandler):
+    """HTTP front end of CheckService.
+    
+    Endpoints:
+        POST /checks              Submit a check ({"type", "host", "nodes"})
+        GET  /checks/<id>         Current state and results of a check
+        GET  /checks/<id>/stream  NDJSON stream of updates until the check ends
+    """
+    
+    service: CheckService = None
+    
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log requests in the same style as the rest of the tool."""
+        print(f"{Fore.CYAN}[{self.log_date_time_string()}] {self.address_string()} {format % args}{Style.RESET_ALL}")
+    
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        """Send a complete JSON response."""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_POST(self) -> None:
+        """Handle check submissions."""
+        if self.path.rstrip("/") != "/checks":
+            self._send_json(404, {"error": "Not found"})
+            return
+        
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            check_type = request.get("type", "ping")
+            if check_type not in ["ping", "http", "tcp", "udp", "dns"]:
+                raise ValueError(f"Invalid check type: {check_type}")
+            host = validate_host(str(request.get("host", "")))
+            nodes = request.get("nodes", "ALL")
+            if isinstance(nodes, str):
+                nodes = get_nodes_selection(nodes)
+            elif not isinstance(nodes, list) or not all(isinstance(node, str) for node in nodes):
+                raise ValueError("Nodes must be a continent selection or a list of node names")
+        except (ValueError, AttributeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        
+        job, shared = self.service.submit(check_type, host, nodes)
+        payload = job.to_dict()
+        payload["shared"] = shared
+        self._send_json(200 if shared else 202, payload)
+    
+    def do_GET(self) -> None:
+        """Handle check lookups and update streams."""
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if len(parts) not in (2, 3) or parts[0] != "checks" or (len(parts) == 3 and parts[2] != "stream"):
+            self._send_json(404, {"error": "Not found"})
+            return
+        
+        job = self.service.get(parts[1])
+        if job is None:
+            self._send_json(404, {"error": f"Unknown check: {parts[1]}"})
+            return
+        
+        if len(parts) == 2:
+            self._send_json(200, job.to_dict())
+        else:
+            self._stream(job)
+    
+    def _stream(self, job: CheckJob) -> None:
+        """Write one JSON line per job update until the job is finished."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        
+        version = -1
+        try:
+            while True:
+                with job.condition:
+                    job.condition.wait_for(lambda: job.version != version, timeout=self.service.timeout)
+                    version = job.version
+                    done = job.done
+                self.wfile.write(json.dumps(job.to_dict()).encode("utf-8") + b"\n")
+                self.wfile.flush()
+                if done:
+                    break
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(bind: str = "127.0.0.1", port: int = 8080, cache_ttl: float = 60,
+          rate_limit: float = 5, workers: int = 16, record: Optional[str] = None,
+          replay: Optional[str] = None, replay_speed: float = 1.0) -> None:
+    """
+    Run the local REST service.
+    
+    Args:
+        bind: Address to listen on
+        port: Port to listen on
+        cache_ttl: Seconds a finished check is served from the cache
+        rate_limit: Maximum requests per second sent to check-host.net
+        workers: Maximum number of checks being submitted at the same time
+        record: File to record every API response to
+        replay: Recording to serve responses from instead of check-host.net
+        replay_speed: Replay speed factor, 0 to replay without any delay
+    """
+    api = create_api(record, replay, replay_speed, rate_limiter=RateLimiter(rate_limit),
+                     pool_size=workers, exit_on_error=False)
+    service = CheckService(api, ResultPoller(api, max_qps=rate_limit), cache_ttl=cache_ttl, workers=workers)
+    CheckServiceHandler.service = service
+    server = ThreadingHTTPServer((bind, port), CheckServiceHandler)
+    server.daemon_threads = True
+    
+    print(f"{Fore.GREEN}Serving Check-Host API on http://{bind}:{port} "
+          f"(cache TTL {cache_ttl:g}s, rate limit {rate_limit:g} req/s){Style.RESET_ALL}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.shutdown()
+        api.close()
 
 
 def main():
@@ -762,24 +2335,73 @@ Examples:
   python check_host.py 1.1.1.1 --nodes EU          # Ping check with European nodes
   python check_host.py example.com --save          # Save results to auto-generated file
   python check_host.py 1.1.1.1 --output ping.json  # Save results to specific file
+  python check_host.py 1.1.1.1 --baseline rtt.json # Flag RTTs far above each node's baseline
+  python check_host.py 1.1.1.1 --format archive    # Append results to check_results.chk
+  python check_host.py --import-results *.json     # Convert saved results into the archive
+  python check_host.py 1.1.1.1 --query --type ping # Read archived ping results for a host
+  python check_host.py 1.1.1.1 --record run.ndjson # Record the API traffic of a check
+  python check_host.py 1.1.1.1 --replay run.ndjson # Replay it offline with the original timing
+  python check_host.py a.com --compare b.com       # Compare two hosts from the same nodes
+  python check_host.py --serve --port 8080         # Run the local REST service
 """
     )
     
     parser.add_argument('host', nargs='?', help='Host to check (domain or IP)')
-    parser.add_argument('--type', choices=['ping', 'http', 'tcp', 'udp', 'dns'], default='ping',
+    parser.add_argument('--type', choices=['ping', 'http', 'tcp', 'udp', 'dns'],
                       help='Type of check to perform (default: ping)')
+    parser.add_argument('--compare', nargs='+', metavar='HOST',
+                      help='Compare the host with these hosts from the same nodes at the same time')
     parser.add_argument('--nodes', default='ALL',
                       help='Nodes to use (ALL, EU, NA, AS, SA, EU+NA)')
     parser.add_argument('--save', action='store_true',
                       help='Save results to file')
     parser.add_argument('--output', help='Output file name')
-    parser.add_argument('--format', choices=['json', 'txt'], default='json',
+    parser.add_argument('--format', choices=['json', 'txt', 'archive'], default='json',
                       help='Output format (default: json)')
+    parser.add_argument('--archive', default=ResultArchive.DEFAULT_FILENAME,
+                      help=f'Archive used by --import-results and --query (default: {ResultArchive.DEFAULT_FILENAME})')
+    parser.add_argument('--import-results', nargs='+', metavar='FILE',
+                      help='Convert json/txt result files into the archive')
+    parser.add_argument('--query', action='store_true',
+                      help='Print archived results as JSON lines, filtered by host, --type, --since and --until')
+    parser.add_argument('--since', help='Only archived results at or after this ISO timestamp')
+    parser.add_argument('--until', help='Only archived results at or before this ISO timestamp')
+    parser.add_argument('--baseline', metavar='FILE',
+                      help='Latency baseline file to update and check for anomalies')
+    parser.add_argument('--anomaly-sigma', type=float, default=4.0,
+                      help='Standard deviations above baseline flagged as anomalous (default: 4)')
+    parser.add_argument('--record', metavar='FILE',
+                      help='Record every API response with its timing to FILE')
+    parser.add_argument('--replay', metavar='FILE',
+                      help='Serve API responses from a recording instead of check-host.net')
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                      help='Replay speed factor, 0 replays without any delay (default: 1)')
+    parser.add_argument('--serve', action='store_true',
+                      help='Run a local REST service instead of a single check')
+    parser.add_argument('--bind', default='127.0.0.1',
+                      help='Address the service listens on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080,
+                      help='Port the service listens on (default: 8080)')
+    parser.add_argument('--cache-ttl', type=float, default=60,
+                      help='Seconds the service reuses a finished check (default: 60)')
+    parser.add_argument('--rate-limit', type=float, default=5,
+                      help='Maximum API requests per second in service mode (default: 5)')
     
     args = parser.parse_args()
     
+    if args.import_results:
+        import_results_to_archive(args.import_results, args.archive)
+    elif args.query:
+        for record in ResultArchive(args.archive).query(
+                host=args.host, check_type=args.type, since=args.since, until=args.until):
+            print(json.dumps(record))
+    elif args.serve:
+        serve(bind=args.bind, port=args.port, cache_ttl=args.cache_ttl, rate_limit=args.rate_limit,
+              record=args.record, replay=args.replay, replay_speed=args.replay_speed)
+    elif args.compare and not args.host:
+        parser.error("--compare needs a host to compare against")
     # If no host provided, run in interactive mode
-    if not args.host:
+    elif not args.host:
         interactive_mode()
     else:
         try:
@@ -787,15 +2409,39 @@ Examples:
             nodes = get_nodes_selection(args.nodes)
             
             save_to_file = args.save or args.output is not None
+            baseline = None
+            if args.baseline:
+                baseline = LatencyBaseline.load(args.baseline, threshold=args.anomaly_sigma)
+            api = create_api(args.record, args.replay, args.replay_speed)
+            
+            try:
+                if args.compare:
+                    compare_and_display(
+                        check_type=args.type or 'ping',
+                        hosts=list(dict.fromkeys([host] + [validate_host(other) for other in args.compare])),
+                        nodes=nodes,
+                        save_to_file=save_to_file,
+                        filename=args.output,
+                        format_type=args.format,
+                        baseline=baseline,
+                        api=api
+                    )
+                else:
+                    run_check_and_display(
+                        check_type=args.type or 'ping',
+                        host=host,
+                        nodes=nodes,
+                        save_to_file=save_to_file,
+                        filename=args.output,
+                        format_type=args.format,
+                        baseline=baseline,
+                        api=api
+                    )
+            finally:
+                api.close()
             
-            run_check_and_display(
-                check_type=args.type,
-                host=host,
-                nodes=nodes,
-                save_to_file=save_to_file,
-                filename=args.output,
-                format_type=args.format
-            )
+            if baseline is not None:
+                baseline.save(args.baseline)
             
         except ValueError as e:
             print(f"{Fore.RED}Error: {e}{Style.RESET_ALL}")